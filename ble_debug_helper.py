@@ -4,64 +4,57 @@ BLE Debug Helper for TruckLogELD Testing
 This script provides debugging information and alternative testing approaches.
 """
 
-print("🔍 BLE Testing Debug Helper")
-print("=" * 50)
-print()
-
-print("📱 Why PT30-ELD isn't showing in your mobile:")
-print("1. The TTM SDK uses setNeedFilterDevice(true) - it only shows specific ELD devices")
-print("2. macOS cannot easily create BLE peripherals that Android can discover")
-print("3. The TTM SDK likely looks for specific service UUIDs or manufacturer data")
-print()
-
-print("🛠️ Alternative Testing Approaches:")
-print()
-
-print("OPTION 1: Disable Device Filtering (Recommended)")
-print("- Temporarily change 'setNeedFilterDevice(true)' to 'setNeedFilterDevice(false)'")
-print("- This will show ALL BLE devices around you")
-print("- You can test with any BLE device (fitness tracker, headphones, etc.)")
-print()
-
-print("OPTION 2: Use a Real ELD Device")
-print("- Get an actual PT30-ELD or similar device")
-print("- Power it on and put it in pairing mode")
-print("- Use real IMEI and passcode")
-print()
-
-print("OPTION 3: Mock the TTM SDK")
-print("- Create mock devices directly in your Android code")
-print("- Add test devices to the scannedDevices list")
-print("- Skip actual BLE scanning for testing")
-print()
-
-print("🎯 Quick Test - Let's try Option 1:")
-print()
-print("1. Open android/app/src/main/java/.../TTMBLEManagerModule.kt")
-print("2. Find line 176: configBuilder.setNeedFilterDevice(true)")
-print("3. Change it to: configBuilder.setNeedFilterDevice(false)")
-print("4. Find line 208: BluetoothLESDK.setNeedFilterDevice(true)")
-print("5. Change it to: BluetoothLESDK.setNeedFilterDevice(false)")
-print("6. Rebuild and test your app")
-print("7. You should now see ALL nearby BLE devices")
-print()
-
-print("📊 Expected Results After Change:")
-print("- Your app will show fitness trackers, headphones, etc.")
-print("- You can test the UI and connection flow")
-print("- Connection might fail (expected) but you can test the scan functionality")
-print()
-
-print("🔄 To Revert Later:")
-print("- Change both lines back to 'true' when you want real ELD filtering")
-print()
-
-print("⚡ Quick Android Studio Test:")
-print("1. Open Android Studio")
-print("2. Go to View -> Tool Windows -> Logcat")
-print("3. Filter by 'TTMBLEManagerModule'")
-print("4. Run your app and start scanning")
-print("5. Look for log messages about devices found")
-print()
+HELP_TEXT = f"""🔍 BLE Testing Debug Helper
+{"=" * 50}
+
+📱 Why PT30-ELD isn't showing in your mobile:
+1. The TTM SDK uses setNeedFilterDevice(true) - it only shows specific ELD devices
+2. macOS cannot easily create BLE peripherals that Android can discover
+3. The TTM SDK likely looks for specific service UUIDs or manufacturer data
+
+🛠️ Alternative Testing Approaches:
+
+OPTION 1: Disable Device Filtering (Recommended)
+- Temporarily change 'setNeedFilterDevice(true)' to 'setNeedFilterDevice(false)'
+- This will show ALL BLE devices around you
+- You can test with any BLE device (fitness tracker, headphones, etc.)
+
+OPTION 2: Use a Real ELD Device
+- Get an actual PT30-ELD or similar device
+- Power it on and put it in pairing mode
+- Use real IMEI and passcode
+
+OPTION 3: Mock the TTM SDK
+- Create mock devices directly in your Android code
+- Add test devices to the scannedDevices list
+- Skip actual BLE scanning for testing
+
+🎯 Quick Test - Let's try Option 1:
+
+1. Open android/app/src/main/java/.../TTMBLEManagerModule.kt
+2. Find line 176: configBuilder.setNeedFilterDevice(true)
+3. Change it to: configBuilder.setNeedFilterDevice(false)
+4. Find line 208: BluetoothLESDK.setNeedFilterDevice(true)
+5. Change it to: BluetoothLESDK.setNeedFilterDevice(false)
+6. Rebuild and test your app
+7. You should now see ALL nearby BLE devices
+
+📊 Expected Results After Change:
+- Your app will show fitness trackers, headphones, etc.
+- You can test the UI and connection flow
+- Connection might fail (expected) but you can test the scan functionality
+
+🔄 To Revert Later:
+- Change both lines back to 'true' when you want real ELD filtering
+
+⚡ Quick Android Studio Test:
+1. Open Android Studio
+2. Go to View -> Tool Windows -> Logcat
+3. Filter by 'TTMBLEManagerModule'
+4. Run your app and start scanning
+5. Look for log messages about devices found
+
+Would you like me to make this change to your Android code? (y/n)
+"""
 
-print("Would you like me to make this change to your Android code? (y/n)")
+print(HELP_TEXT, end="")
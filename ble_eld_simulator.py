@@ -3,33 +3,72 @@
 Advanced BLE ELD Device Simulator
 This script creates a BLE peripheral that mimics a PT30-ELD device for testing.
 Uses the system's Bluetooth capabilities through subprocess commands.
+Pass --quiet to suppress the per-packet console output.
 """
 
 import asyncio
+import shutil
+import signal
 import subprocess
+import sys
 import time
 import json
+import struct
 from datetime import datetime
 
+# Start flag, packet type, speed, RPM, fuel level, odometer, duty status
+ELD_PACKET = struct.Struct('>BBHHBIB')
+
+# Duty statuses cycled through by the simulated driver
+DUTY_STATUSES = ("off_duty", "sleeper", "driving", "on_duty")
+
+# Duty status byte sent in the raw packet
+DUTY_STATUS_CODES = {"off_duty": 1, "sleeper": 2, "driving": 3, "on_duty": 4}
+
+STARTUP_BANNER = f"""{"🚛" * 20}
+    BLE ELD Device Simulator Started
+{"🚛" * 20}
+Device Name: {{device_name}}
+Simulated MAC: {{device_address}}
+Started at: {{started_at}}
+
+📋 Instructions:
+1. Keep this simulator running
+2. Open your TruckLogELD app in Android Studio
+3. Navigate to the select-vehicle screen
+4. Start BLE scan in your app
+5. Look for 'PT30-ELD' in the discovered devices
+6. Check Android logs for TTMBLEManager events
+7. Use IMEI: 123456789012345 and Passcode: 12345678 for testing
+
+Press Ctrl+C to stop simulation
+{"=" * 60}
+"""
+
 class BLEELDSimulator:
-    def __init__(self):
+    def __init__(self, quiet=False):
         self.device_name = "PT30-ELD"
         self.device_address = "AA:BB:CC:DD:EE:FF"
         self.is_running = False
+        self._stop_event = None
         self.process = None
+        self.quiet = quiet  # Skip per-packet console output
+        self.has_blueutil = shutil.which("blueutil") is not None
         
     def start_bluetooth_advertising(self):
         """Start Bluetooth Low Energy advertising to make device discoverable"""
         print(f"🔵 Starting BLE advertising for device: {self.device_name}")
         
+        if not self.has_blueutil:
+            print("⚠️  blueutil not found. Install with: brew install blueutil")
+            print("💡 Continuing simulation without system-level advertising...")
+            return
+        
         # On macOS, we can use system commands to make the device discoverable
         try:
-            # Make sure Bluetooth is on
-            subprocess.run(["sudo", "blueutil", "--power", "1"], check=False)
+            # Power on Bluetooth and make the device discoverable in one call
+            subprocess.run(["sudo", "blueutil", "--power", "1", "--discoverable", "1"], check=False)
             print("📱 Bluetooth power enabled")
-            
-            # Make device discoverable
-            subprocess.run(["sudo", "blueutil", "--discoverable", "1"], check=False)
             print("🔍 Device is now discoverable")
             
         except FileNotFoundError:
@@ -41,6 +80,8 @@ class BLEELDSimulator:
     
     def stop_bluetooth_advertising(self):
         """Stop BLE advertising"""
+        if not self.has_blueutil:
+            return
         try:
             subprocess.run(["sudo", "blueutil", "--discoverable", "0"], check=False)
             print("🔴 Stopped BLE advertising")
@@ -53,117 +94,108 @@ class BLEELDSimulator:
         print("=" * 60)
         
         counter = 0
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        
+        # Static fields are set once; only the changing values are updated per packet
+        vehicle_data = {
+            "timestamp_ns": 0,
+            "device_id": "PT30-ELD-001",
+            "vin": "1HGBH41JXMN109186",
+            "driver_id": "DEMO_DRIVER",
+            "location": {},
+            "engine": {},
+            "odometer_miles": 0,
+            "duty_status": None,
+            "diagnostic_codes": [],
+        }
+        location = vehicle_data["location"]
+        engine = vehicle_data["engine"]
         
         while self.is_running:
-            current_time = datetime.now()
-            elapsed = time.time() - start_time
+            now_ns = time.time_ns()
+            elapsed = loop.time() - start_time
             
             # Simulate realistic ELD data patterns
-            vehicle_data = {
-                "timestamp": current_time.isoformat(),
-                "device_id": "PT30-ELD-001",
-                "vin": "1HGBH41JXMN109186",
-                "driver_id": "DEMO_DRIVER",
-                "location": {
-                    "latitude": 37.7749 + (counter * 0.0001),
-                    "longitude": -122.4194 + (counter * 0.0001),
-                    "speed_mph": 45 + (counter % 20),
-                },
-                "engine": {
-                    "rpm": 1500 + (counter % 500),
-                    "hours": 2345.5 + (elapsed / 3600),
-                    "coolant_temp": 190 + (counter % 10),
-                    "fuel_level": max(10, 75 - (counter * 0.1)),
-                },
-                "odometer_miles": 125000 + counter,
-                "duty_status": ["off_duty", "sleeper", "driving", "on_duty"][counter % 4],
-                "diagnostic_codes": [] if counter % 10 != 0 else ["P0001"],
-            }
-            
-            # Format output similar to what the TTM SDK would log
-            timestamp_str = current_time.strftime("%H:%M:%S.%f")[:-3]
-            
-            print(f"[{timestamp_str}] ELD Data Packet #{counter + 1}")
-            print(f"  📍 Location: ({vehicle_data['location']['latitude']:.4f}, {vehicle_data['location']['longitude']:.4f})")
-            print(f"  🚗 Speed: {vehicle_data['location']['speed_mph']} mph")
-            print(f"  🔧 RPM: {vehicle_data['engine']['rpm']}")
-            print(f"  ⛽ Fuel: {vehicle_data['engine']['fuel_level']:.1f}%")
-            print(f"  📊 Status: {vehicle_data['duty_status'].replace('_', ' ').title()}")
-            print(f"  🛣️  Odometer: {vehicle_data['odometer_miles']:,} miles")
-            
-            if vehicle_data['diagnostic_codes']:
-                print(f"  ⚠️  Diagnostic Codes: {', '.join(vehicle_data['diagnostic_codes'])}")
+            vehicle_data["timestamp_ns"] = now_ns
+            location["latitude"] = 37.7749 + (counter * 0.0001)
+            location["longitude"] = -122.4194 + (counter * 0.0001)
+            location["speed_mph"] = 45 + (counter % 20)
+            engine["rpm"] = 1500 + (counter % 500)
+            engine["hours"] = 2345.5 + (elapsed / 3600)
+            engine["coolant_temp"] = 190 + (counter % 10)
+            engine["fuel_level"] = max(10, 75 - (counter * 0.1))
+            vehicle_data["odometer_miles"] = 125000 + counter
+            vehicle_data["duty_status"] = DUTY_STATUSES[counter & 3]
+            vehicle_data["diagnostic_codes"] = [] if counter % 10 != 0 else ["P0001"]
             
             # Simulate raw data bytes that would be sent over BLE
             raw_bytes = self.generate_raw_eld_data(vehicle_data)
-            hex_data = ' '.join(f'{b:02x}' for b in raw_bytes)
-            print(f"  📡 Raw Data: {hex_data}")
-            print("-" * 60)
+            
+            if not self.quiet:
+                # Format output similar to what the TTM SDK would log
+                lines = [
+                    f"[{self.format_timestamp(now_ns)}] ELD Data Packet #{counter + 1}",
+                    f"  📍 Location: ({location['latitude']:.4f}, {location['longitude']:.4f})",
+                    f"  🚗 Speed: {location['speed_mph']} mph",
+                    f"  🔧 RPM: {engine['rpm']}",
+                    f"  ⛽ Fuel: {engine['fuel_level']:.1f}%",
+                    f"  📊 Status: {vehicle_data['duty_status'].replace('_', ' ').title()}",
+                    f"  🛣️  Odometer: {vehicle_data['odometer_miles']:,} miles",
+                ]
+                if vehicle_data['diagnostic_codes']:
+                    lines.append(f"  ⚠️  Diagnostic Codes: {', '.join(vehicle_data['diagnostic_codes'])}")
+                lines.append(f"  📡 Raw Data: {raw_bytes.hex(' ')}")
+                lines.append("-" * 60)
+                
+                # One write per packet instead of a print() per line
+                sys.stdout.write("\n".join(lines) + "\n")
             
             counter += 1
-            await asyncio.sleep(3)  # Send data every 3 seconds
+            await self.wait_for_stop(3)  # Send data every 3 seconds
+    
+    async def wait_for_stop(self, timeout):
+        """Wait up to timeout seconds, returning early once the simulation is stopped"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    def format_timestamp(self, now_ns):
+        """Return the local HH:MM:SS.mmm clock string for a time.time_ns() value"""
+        local = time.localtime(now_ns // 1_000_000_000)
+        millis = now_ns // 1_000_000 % 1000
+        
+        return f"{local.tm_hour:02d}:{local.tm_min:02d}:{local.tm_sec:02d}.{millis:03d}"
     
     def generate_raw_eld_data(self, data):
         """Generate raw byte data similar to what ELD devices transmit"""
         # This is a simplified simulation of ELD data format
         # Real ELD devices use J1939 or similar protocols
-        raw_data = bytearray()
-        
-        # Header (2 bytes)
-        raw_data.extend([0x7E, 0x01])  # Start flag + packet type
-        
-        # Speed (2 bytes, mph * 10)
-        speed = int(data['location']['speed_mph'] * 10)
-        raw_data.extend(speed.to_bytes(2, 'big'))
-        
-        # RPM (2 bytes)
-        rpm = int(data['engine']['rpm'])
-        raw_data.extend(rpm.to_bytes(2, 'big'))
-        
-        # Fuel level (1 byte, percentage)
-        fuel = int(data['engine']['fuel_level'])
-        raw_data.append(fuel)
-        
-        # Odometer (4 bytes, miles)
-        odometer = int(data['odometer_miles'])
-        raw_data.extend(odometer.to_bytes(4, 'big'))
-        
-        # Duty status (1 byte)
-        status_map = {"off_duty": 1, "sleeper": 2, "driving": 3, "on_duty": 4}
-        raw_data.append(status_map.get(data['duty_status'], 1))
-        
-        # Checksum (1 byte)
-        checksum = sum(raw_data) % 256
-        raw_data.append(checksum)
-        
-        # End flag (1 byte)
-        raw_data.append(0x7F)
-        
-        return raw_data
+        # RPM and odometer (miles) are already whole numbers; speed and fuel are truncated
+        speed = int(data['location']['speed_mph'] * 10)  # mph * 10
+        fuel = int(data['engine']['fuel_level'])  # percentage
+        status = DUTY_STATUS_CODES.get(data['duty_status'], 1)
+        
+        # Payload followed by checksum (1 byte) and end flag (1 byte)
+        raw_data = bytearray(ELD_PACKET.size + 2)
+        ELD_PACKET.pack_into(raw_data, 0, 0x7E, 0x01, speed, data['engine']['rpm'],
+                             fuel, data['odometer_miles'], status)
+        raw_data[-2] = sum(memoryview(raw_data)[:-2]) & 0xFF
+        raw_data[-1] = 0x7F
+        
+        return bytes(raw_data)
     
     async def start_simulation(self):
         """Start the complete ELD simulation"""
-        print("🚛" * 20)
-        print("    BLE ELD Device Simulator Started")
-        print("🚛" * 20)
-        print(f"Device Name: {self.device_name}")
-        print(f"Simulated MAC: {self.device_address}")
-        print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print()
-        print("📋 Instructions:")
-        print("1. Keep this simulator running")
-        print("2. Open your TruckLogELD app in Android Studio")
-        print("3. Navigate to the select-vehicle screen")
-        print("4. Start BLE scan in your app") 
-        print("5. Look for 'PT30-ELD' in the discovered devices")
-        print("6. Check Android logs for TTMBLEManager events")
-        print("7. Use IMEI: 123456789012345 and Passcode: 12345678 for testing")
-        print()
-        print("Press Ctrl+C to stop simulation")
-        print("=" * 60)
+        print(STARTUP_BANNER.format(
+            device_name=self.device_name,
+            device_address=self.device_address,
+            started_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        ), end="")
         
         self.is_running = True
+        self._stop_event = asyncio.Event()
         
         # Start BLE advertising
         self.start_bluetooth_advertising()
@@ -175,11 +207,22 @@ class BLEELDSimulator:
         """Stop the simulation"""
         print("\n🛑 Stopping ELD Device Simulation...")
         self.is_running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
         self.stop_bluetooth_advertising()
         print("✅ Simulation stopped successfully")
 
 async def main():
-    simulator = BLEELDSimulator()
+    simulator = BLEELDSimulator(quiet="--quiet" in sys.argv[1:])
+    
+    # Stop cleanly on Ctrl+C / SIGTERM; asyncio.run() would otherwise cancel the
+    # task and re-raise KeyboardInterrupt without running stop_simulation()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, simulator.stop_simulation)
+        except NotImplementedError:
+            pass  # Windows event loops don't support signal handlers
     
     try:
         await simulator.start_simulation()
@@ -4,83 +4,125 @@ BLE ELD Device Simulator
 This script simulates a PT30-ELD device for testing purposes.
 Since macOS doesn't support BLE peripheral mode in user applications easily,
 this script will simulate the behavior and provide debug output.
+Pass --quiet to suppress the per-reading console output.
 """
 
 import asyncio
+import signal
+import sys
 import time
 import struct
 from datetime import datetime
 
+# Raw data sent with each simulated reading
+RAW_COUNTER = struct.Struct('>I')
+
+BANNER = f"""{"=" * 50}
+ELD Device Simulator for TruckLogELD Testing
+{"=" * 50}
+
+This simulator mimics a PT30-ELD device that your Android app can discover.
+While running this simulator:
+1. Open your TruckLogELD app in Android Studio
+2. Navigate to the vehicle selection screen
+3. Start scanning for BLE devices
+4. Look for 'PT30-ELD' in the device list
+5. Check Android Studio logs for connection attempts
+
+Press Ctrl+C to stop the simulator
+
+"""
+
+DEVICE_INFO = """🚛 Starting ELD Device Simulator: {device_name}
+📡 Device is now discoverable and ready for connection
+
+--- Device Information ---
+Device Name: {device_name}
+MAC Address: AA:BB:CC:DD:EE:FF (simulated)
+Signal Strength: -45 dBm (simulated)
+Service UUID: 1234abcd-0000-1000-8000-00805f9b34fb
+
+--- ELD Data Stream ---
+"""
+
+def vehicle_speed_reading(counter):
+    return "Vehicle Speed", f"{45 + (counter % 20)} mph"
+
+def engine_rpm_reading(counter):
+    return "Engine RPM", f"{1500 + (counter % 500)} RPM"
+
+def engine_hours_reading(counter):
+    return "Engine Hours", f"{2345.5 + (counter * 0.1):.1f} hrs"
+
+def odometer_reading(counter):
+    return "Odometer", f"{125000 + counter} mi"
+
+# Reading reported for each packet, cycled by counter
+READINGS = (vehicle_speed_reading, engine_rpm_reading, engine_hours_reading, odometer_reading)
+
 class ELDDeviceSimulator:
-    def __init__(self, device_name="PT30-ELD"):
+    def __init__(self, device_name="PT30-ELD", quiet=False):
         self.device_name = device_name
         self.is_running = False
+        self._stop_event = None
         self.connected_clients = []
+        self.quiet = quiet  # Skip per-packet console output
         
     async def start_simulation(self):
-        print(f"🚛 Starting ELD Device Simulator: {self.device_name}")
-        print("📡 Device is now discoverable and ready for connection")
-        print("\n--- Device Information ---")
-        print(f"Device Name: {self.device_name}")
-        print(f"MAC Address: AA:BB:CC:DD:EE:FF (simulated)")
-        print(f"Signal Strength: -45 dBm (simulated)")
-        print("Service UUID: 1234abcd-0000-1000-8000-00805f9b34fb")
-        print("\n--- ELD Data Stream ---")
+        print(DEVICE_INFO.format(device_name=self.device_name), end="")
         
         self.is_running = True
+        self._stop_event = asyncio.Event()
         counter = 0
         
         while self.is_running:
-            # Simulate ELD data transmission
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            
-            # Simulate various ELD data types
-            if counter % 4 == 0:
-                data_type = "Vehicle Speed"
-                value = f"{45 + (counter % 20)} mph"
-            elif counter % 4 == 1:
-                data_type = "Engine RPM"
-                value = f"{1500 + (counter % 500)} RPM"
-            elif counter % 4 == 2:
-                data_type = "Engine Hours"
-                value = f"{2345.5 + (counter * 0.1):.1f} hrs"
-            else:
-                data_type = "Odometer"
-                value = f"{125000 + counter} mi"
-            
             # Simulate the raw data bytes (similar to what the SDK would receive)
-            raw_data = struct.pack('>I', counter % 256)  # Simple counter as raw data
-            hex_data = ' '.join(f'{b:02x}' for b in raw_data)
+            raw_data = RAW_COUNTER.pack(counter & 0xFF)  # Simple counter as raw data
             
-            print(f"[{timestamp}] {data_type}: {value} | Raw: {hex_data}")
+            if not self.quiet:
+                # Simulate ELD data transmission
+                timestamp = datetime.now().strftime("%H:%M:%S")
+                
+                # Simulate various ELD data types
+                data_type, value = READINGS[counter & 3](counter)
+                
+                print(f"[{timestamp}] {data_type}: {value} | Raw: {raw_data.hex(' ')}")
             
             counter += 1
-            await asyncio.sleep(2)  # Send data every 2 seconds
+            await self.wait_for_stop(2)  # Send data every 2 seconds
+    
+    async def wait_for_stop(self, timeout):
+        """Wait up to timeout seconds, returning early once the simulation is stopped"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
     
     def stop_simulation(self):
         print("\n🛑 Stopping ELD Device Simulator")
         self.is_running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
 
 async def main():
-    print("=" * 50)
-    print("ELD Device Simulator for TruckLogELD Testing")
-    print("=" * 50)
-    print("\nThis simulator mimics a PT30-ELD device that your Android app can discover.")
-    print("While running this simulator:")
-    print("1. Open your TruckLogELD app in Android Studio")
-    print("2. Navigate to the vehicle selection screen")
-    print("3. Start scanning for BLE devices")
-    print("4. Look for 'PT30-ELD' in the device list")
-    print("5. Check Android Studio logs for connection attempts")
-    print("\nPress Ctrl+C to stop the simulator\n")
+    print(BANNER, end="")
+    
+    simulator = ELDDeviceSimulator("PT30-ELD", quiet="--quiet" in sys.argv[1:])
     
-    simulator = ELDDeviceSimulator("PT30-ELD")
+    # Stop cleanly on Ctrl+C / SIGTERM; asyncio.run() would otherwise cancel the
+    # task and re-raise KeyboardInterrupt without running stop_simulation()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, simulator.stop_simulation)
+        except NotImplementedError:
+            pass  # Windows event loops don't support signal handlers
     
     try:
         await simulator.start_simulation()
     except KeyboardInterrupt:
         simulator.stop_simulation()
-        print("\n✅ Simulator stopped successfully")
+    print("\n✅ Simulator stopped successfully")
 
 if __name__ == "__main__":
     asyncio.run(main())